@@ -11,9 +11,7 @@ import zipfile
 from pathlib import Path
 from typing import Generator
 
-import requests
-
-from .base import BaseFetcher, IconCategory
+from .base import BaseFetcher, IconCategory, search_streaming, svg_members_by_dir
 
 
 class AzureFetcher(BaseFetcher):
@@ -22,12 +20,14 @@ class AzureFetcher(BaseFetcher):
     # Microsoft's official Azure icons page
     ICONS_PAGE_URL = "https://learn.microsoft.com/en-us/azure/architecture/icons/"
     
-    # Pattern to find the download link
-    DOWNLOAD_PATTERN = r'https://arch-center\.azureedge\.net/icons/Azure_Public_Service_Icons_V\d+\.zip'
+    # Pattern to find the download link (compiled once at class creation)
+    DOWNLOAD_PATTERN = re.compile(
+        r'https://arch-center\.azureedge\.net/icons/Azure_Public_Service_Icons_V\d+\.zip'
+    )
     
     def __init__(self, cache_dir: Path):
         super().__init__(cache_dir)
-        self._icons_dir: Path | None = None
+        self._zip: zipfile.ZipFile | None = None
     
     @property
     def name(self) -> str:
@@ -41,11 +41,8 @@ class AzureFetcher(BaseFetcher):
         """Find the latest download URL from Microsoft's page."""
         print(f"  Fetching download URL from {self.ICONS_PAGE_URL}...")
         
-        response = requests.get(self.ICONS_PAGE_URL, timeout=30)
-        response.raise_for_status()
-        
-        # Find download link in page content
-        match = re.search(self.DOWNLOAD_PATTERN, response.text)
+        # Stream the page and stop at the first link match
+        match = search_streaming(self.ICONS_PAGE_URL, self.DOWNLOAD_PATTERN)
         if not match:
             raise RuntimeError("Could not find Azure icons download URL")
         
@@ -57,97 +54,76 @@ class AzureFetcher(BaseFetcher):
         """Download the ZIP file."""
         zip_path = self.cache_dir / "azure_icons.zip"
         
-        # Check if already downloaded (simple cache)
+        # Check if already downloaded, revalidating with a conditional GET
         if zip_path.exists():
-            print(f"  Using cached: {zip_path}")
-            return zip_path
-        
-        print(f"  Downloading...")
-        response = requests.get(url, timeout=120, stream=True)
-        response.raise_for_status()
-        
-        # Get file size for progress
-        total_size = int(response.headers.get('content-length', 0))
-        
-        with open(zip_path, 'wb') as f:
-            downloaded = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-                downloaded += len(chunk)
-                if total_size:
-                    percent = (downloaded / total_size) * 100
-                    print(f"\r  Downloaded: {percent:.1f}%", end='', flush=True)
-        
-        print(f"\n  Saved: {zip_path} ({zip_path.stat().st_size // 1024 // 1024} MB)")
+            if self._cache_is_fresh(url, zip_path):
+                print(f"  Using cached: {zip_path}")
+                return zip_path
+            print("  Cached archive is stale, re-downloading...")
+
+        print("  Downloading...")
+        self._download(url, zip_path)
+        print(f"  Saved: {zip_path} ({zip_path.stat().st_size // 1024 // 1024} MB)")
         return zip_path
     
-    def _extract_zip(self, zip_path: Path) -> Path:
-        """Extract the ZIP file."""
-        extract_dir = self.cache_dir / "azure_icons"
-        
-        # Check if already extracted
-        if extract_dir.exists() and any(extract_dir.iterdir()):
-            print(f"  Using cached extraction: {extract_dir}")
-            return extract_dir
-        
-        print(f"  Extracting...")
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            zf.extractall(extract_dir)
-        
-        print(f"  Extracted to: {extract_dir}")
-        return extract_dir
-    
     def fetch(self) -> Path:
-        """Download and extract Azure icons."""
+        """Download Azure icons and open the archive for streaming reads."""
         print(f"[{self.display_name}]")
-        
+
         url = self._find_download_url()
         zip_path = self._download_zip(url)
-        self._icons_dir = self._extract_zip(zip_path)
-        
-        return self._icons_dir
-    
-    def _find_svg_root(self) -> Path:
-        """Find the root directory containing SVG category folders."""
-        if not self._icons_dir:
-            raise RuntimeError("Must call fetch() first")
-        
+        # Read SVGs straight from the archive instead of extracting every
+        # icon to disk and reading it back
+        self._zip = zipfile.ZipFile(zip_path)
+
+        return zip_path
+
+    def _find_svg_root(self, svg_dirs: dict[str, list]) -> str:
+        """Find the archive directory containing SVG category folders."""
         # Azure ZIP structure varies, find the directory with category folders
         # Usually something like: Azure_Public_Service_Icons_V*/Icons/
-        for path in self._icons_dir.rglob('*'):
-            if path.is_dir() and path.name == 'Icons':
-                return path
-        
-        # Fallback: look for directories containing SVG files
-        for path in self._icons_dir.iterdir():
-            if path.is_dir():
-                # Check if it contains subdirectories with SVGs
-                subdirs = [d for d in path.iterdir() if d.is_dir()]
-                if subdirs and any(list(subdirs[0].glob('*.svg'))):
-                    return path
-        
-        raise RuntimeError(f"Could not find SVG root directory in {self._icons_dir}")
-    
+        roots = set()
+        for dir_path in svg_dirs:
+            parts = dir_path.split('/') if dir_path else []
+            if 'Icons' in parts:
+                roots.add('/'.join(parts[:parts.index('Icons') + 1]))
+        if roots:
+            return min(roots, key=len)
+
+        # Fallback: the longest directory prefix shared by every SVG
+        prefixes = [d.split('/') if d else [] for d in svg_dirs]
+        common = prefixes[0]
+        for parts in prefixes[1:]:
+            while common != parts[:len(common)]:
+                common = common[:-1]
+        return '/'.join(common)
+
     def get_categories(self) -> Generator[IconCategory, None, None]:
         """Get Azure icon categories."""
-        if not self._icons_dir:
+        if not self._zip:
             raise RuntimeError("Must call fetch() first")
-        
-        svg_root = self._find_svg_root()
-        print(f"  SVG root: {svg_root}")
-        
-        # Each subdirectory is a category
-        for category_dir in sorted(svg_root.iterdir()):
-            if not category_dir.is_dir():
+
+        svg_dirs = svg_members_by_dir(self._zip)
+        if not svg_dirs:
+            raise RuntimeError(f"No SVG files found in {self._zip.filename}")
+
+        svg_root = self._find_svg_root(svg_dirs)
+        print(f"  SVG root: {svg_root or '<zip root>'}")
+
+        # Each subdirectory of the root is a category; collect its SVGs
+        # (they may sit in nested subdirectories)
+        root_parts = svg_root.split('/') if svg_root else []
+        categories: dict[str, list] = {}
+        for dir_path, svg_files in sorted(svg_dirs.items()):
+            parts = dir_path.split('/') if dir_path else []
+            if parts[:len(root_parts)] != root_parts or len(parts) == len(root_parts):
                 continue
-            
-            # Find all SVG files (may be in subdirectories)
-            svg_files = sorted(category_dir.rglob('*.svg'))
-            
-            if svg_files:
-                # Clean up category name
-                category_name = category_dir.name.replace('-', ' ').replace('_', ' ')
-                yield IconCategory(name=category_name, svg_files=svg_files)
+            categories.setdefault(parts[len(root_parts)], []).extend(svg_files)
+
+        for category, svg_files in sorted(categories.items()):
+            # Clean up category name
+            category_name = category.replace('-', ' ').replace('_', ' ')
+            yield IconCategory(name=category_name, svg_files=svg_files)
     
     def cleanup(self) -> None:
         """Remove cached files."""
@@ -15,7 +15,11 @@ from typing import Generator
 
 import requests
 
-from .base import BaseFetcher, IconCategory
+from .base import SESSION, BaseFetcher, IconCategory, svg_members_by_dir
+
+# Compiled once at import; both run against full page bodies
+_ZIP_URL_RE = re.compile(r"https?://[^\"'\s>]+\.zip", re.IGNORECASE)
+_SVG_ICONS_LINK_RE = re.compile(r"\[Download SVG icons\]\(([^)]+)\)", re.IGNORECASE)
 
 
 class Microsoft365Fetcher(BaseFetcher):
@@ -29,7 +33,7 @@ class Microsoft365Fetcher(BaseFetcher):
 
     def __init__(self, cache_dir: Path):
         super().__init__(cache_dir)
-        self._icons_dir: Path | None = None
+        self._zip: zipfile.ZipFile | None = None
 
     @property
     def name(self) -> str:
@@ -86,20 +90,20 @@ class Microsoft365Fetcher(BaseFetcher):
         print(f"  Fetching download URL from {self.ICONS_PAGE_URL}...")
 
         # 1) Try the rendered page for direct .zip URLs (may not exist).
-        page = requests.get(self.ICONS_PAGE_URL, timeout=30)
+        page = SESSION.get(self.ICONS_PAGE_URL, timeout=30)
         page.raise_for_status()
-        zip_urls = re.findall(r"https?://[^\"'\s>]+\.zip", page.text, flags=re.IGNORECASE)
+        zip_urls = _ZIP_URL_RE.findall(page.text)
         if zip_urls:
             url = self._choose_best_zip_url(zip_urls)
             print(f"  Found: {url}")
             return url
 
         # 2) Fallback: parse the page's raw markdown from GitHub.
-        md = requests.get(self.ICONS_PAGE_MARKDOWN_URL, timeout=30)
+        md = SESSION.get(self.ICONS_PAGE_MARKDOWN_URL, timeout=30)
         md.raise_for_status()
 
         # The markdown contains an fwlink for SVG icons.
-        match = re.search(r"\[Download SVG icons\]\(([^)]+)\)", md.text, flags=re.IGNORECASE)
+        match = _SVG_ICONS_LINK_RE.search(md.text)
         if not match:
             raise RuntimeError("Could not find 'Download SVG icons' link in page markdown")
 
@@ -112,13 +116,13 @@ class Microsoft365Fetcher(BaseFetcher):
     def _resolve_download_url(url: str) -> str:
         """Resolve fwlink/aka.ms URLs to the final downloadable URL."""
         try:
-            response = requests.head(url, timeout=30, allow_redirects=True)
+            response = SESSION.head(url, timeout=30, allow_redirects=True)
             if response.status_code >= 400:
                 raise requests.HTTPError(f"HTTP {response.status_code}")
             return response.url
         except Exception:
             # Some endpoints don't support HEAD; fall back to GET (streaming) just to resolve.
-            response = requests.get(url, timeout=30, allow_redirects=True, stream=True)
+            response = SESSION.get(url, timeout=30, allow_redirects=True, stream=True)
             response.raise_for_status()
             return response.url
 
@@ -126,94 +130,46 @@ class Microsoft365Fetcher(BaseFetcher):
         """Download the ZIP file."""
         zip_path = self.cache_dir / "microsoft365_icons.zip"
 
-        # Check if already downloaded (simple cache)
+        # Check if already downloaded, revalidating with a conditional GET
         if zip_path.exists():
-            print(f"  Using cached: {zip_path}")
-            return zip_path
+            if self._cache_is_fresh(url, zip_path):
+                print(f"  Using cached: {zip_path}")
+                return zip_path
+            print("  Cached archive is stale, re-downloading...")
 
         print("  Downloading...")
-        response = requests.get(url, timeout=120, stream=True)
-        response.raise_for_status()
-
-        total_size = int(response.headers.get("content-length", 0))
-
-        with open(zip_path, "wb") as f:
-            downloaded = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                if not chunk:
-                    continue
-                f.write(chunk)
-                downloaded += len(chunk)
-                if total_size:
-                    percent = (downloaded / total_size) * 100
-                    print(f"\r  Downloaded: {percent:.1f}%", end="", flush=True)
-
-        if total_size:
-            print()
-
+        self._download(url, zip_path)
         print(f"  Saved: {zip_path} ({zip_path.stat().st_size // 1024 // 1024} MB)")
         return zip_path
 
-    def _extract_zip(self, zip_path: Path) -> Path:
-        """Extract the ZIP file."""
-        extract_dir = self.cache_dir / "microsoft365_icons"
-
-        # Check if already extracted
-        if extract_dir.exists() and any(extract_dir.iterdir()):
-            print(f"  Using cached extraction: {extract_dir}")
-            return extract_dir
-
-        print("  Extracting...")
-        extract_dir.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            zf.extractall(extract_dir)
-
-        print(f"  Extracted to: {extract_dir}")
-        return extract_dir
-
     def fetch(self) -> Path:
-        """Download and extract Microsoft 365 icons."""
+        """Download Microsoft 365 icons and open the archive for streaming reads."""
         print(f"[{self.display_name}]")
 
         url = self._find_download_url()
         zip_path = self._download_zip(url)
-        self._icons_dir = self._extract_zip(zip_path)
+        # Read SVGs straight from the archive instead of extracting every
+        # icon to disk and reading it back
+        self._zip = zipfile.ZipFile(zip_path)
 
-        return self._icons_dir
+        return zip_path
 
-    def _iter_svg_leaf_dirs(self) -> list[Path]:
-        """Return directories that directly contain SVG files.
+    def get_categories(self) -> Generator[IconCategory, None, None]:
+        """Get Microsoft 365 icon categories.
 
-        We treat each such directory as one icon category to avoid accidentally
-        collapsing different themes (Microsoft Blue/Teams Purple/etc.) into one.
+        Each archive directory that directly contains SVGs becomes one
+        category, to avoid accidentally collapsing different themes
+        (Microsoft Blue/Teams Purple/etc.) into one.
         """
-        if not self._icons_dir:
+        if not self._zip:
             raise RuntimeError("Must call fetch() first")
 
-        svg_dirs: set[Path] = set()
-
-        # Include any directory that has SVGs directly within it.
-        for svg_file in sorted(self._icons_dir.rglob("*.svg")):
-            svg_dirs.add(svg_file.parent)
-
-        return sorted(svg_dirs, key=lambda p: str(p))
-
-    def get_categories(self) -> Generator[IconCategory, None, None]:
-        """Get Microsoft 365 icon categories."""
-        if not self._icons_dir:
-            raise RuntimeError("Must call fetch() first")
-
-        category_dirs = self._iter_svg_leaf_dirs()
-        print(f"  Found {len(category_dirs)} SVG folders")
-
-        for category_dir in category_dirs:
-            svg_files = sorted(category_dir.glob("*.svg"))
-            if not svg_files:
-                continue
+        svg_dirs = svg_members_by_dir(self._zip)
+        print(f"  Found {len(svg_dirs)} SVG folders")
 
-            rel = category_dir.relative_to(self._icons_dir)
+        for dir_path, svg_files in sorted(svg_dirs.items()):
             # Use the relative path as the category name to keep it unique.
-            category_name = " / ".join(rel.parts)
+            category_name = " / ".join(dir_path.split("/")) if dir_path else "Microsoft 365"
             yield IconCategory(name=category_name, svg_files=svg_files)
 
     def cleanup(self) -> None:
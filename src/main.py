@@ -7,17 +7,56 @@ diagrams.net custom library XML files.
 """
 
 import argparse
+import asyncio
+import logging
+import multiprocessing
 import shutil
+import string
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    # orjson indents and emits UTF-8 bytes directly, skipping the stdlib
+    # encoder's Python-level string building. Optional: falls back to json.
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.fetchers.azure import AzureFetcher
 from src.fetchers.dynamics365 import Dynamics365Fetcher
 from src.fetchers.entra import EntraFetcher
 from src.fetchers.fabric import FabricFetcher
 from src.fetchers.microsoft365 import Microsoft365Fetcher
 from src.converters.svg_to_drawio import (
-    create_library_entry_from_file,
-    create_library_xml,
+    submit_svg_files,
+    write_library_xml,
+)
+
+
+logger = logging.getLogger("drawio-gen")
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler without the per-record flush.
+
+    Per-icon log lines ride stdout's own block buffer instead of costing a
+    write() syscall each; print() shares the same stream, so ordering is
+    preserved and the interpreter flushes everything on exit.
+    """
+
+    def flush(self) -> None:
+        pass
+
+
+# Deletes every ASCII character that is not lowercase alphanumeric or '-';
+# str.translate runs the filter in C instead of a per-character generator.
+# Only valid for ASCII input: non-ASCII names fall back to the character
+# filter so unicode letters survive and unicode punctuation is dropped,
+# exactly as before.
+_SAFE_CHARS = frozenset(string.ascii_lowercase + string.digits + "-")
+_SAFE_TRANS = str.maketrans(
+    {c: None for c in map(chr, range(128)) if c not in _SAFE_CHARS}
 )
 
 
@@ -25,16 +64,21 @@ def _safe_filename(name: str) -> str:
     safe = name.lower().strip()
     safe = safe.replace("&", "and").replace("+", "and")
     safe = "-".join(safe.split())
-    safe = "".join(c for c in safe if c.isalnum() or c == "-")
+    if safe.isascii():
+        safe = safe.translate(_SAFE_TRANS)
+    else:
+        safe = "".join(c for c in safe if c.isalnum() or c == "-")
     return safe.strip("-") or "category"
 
 
-def generate_libraries(fetcher, output_dir: Path) -> dict:
+def generate_libraries(fetcher, output_dir: Path, executor: ProcessPoolExecutor) -> dict:
     """Generate diagrams.net libraries for all categories of a fetcher."""
     fetcher.fetch()
 
     provider_output = output_dir / fetcher.name
     provider_output.mkdir(parents=True, exist_ok=True)
+    # Resolved once; per-category paths below reduce to string arithmetic
+    output_parent = output_dir.parent
 
     stats = {
         "categories": 0,
@@ -42,40 +86,90 @@ def generate_libraries(fetcher, output_dir: Path) -> dict:
         "files": [],
     }
 
-    print("\nGenerating libraries...")
+    logger.info("\nGenerating libraries...")
+
+    # Converted entries persist next to the downloaded archives, keyed by
+    # SVG content hash; unchanged icons skip conversion on re-runs
+    entry_cache = fetcher.cache_dir / "entries"
+
+    # Entry conversion is CPU-bound (parse + base64 + deflate); fan each
+    # category out across the process pool shared by all providers.
+    # Library files are written from a single writer thread so each
+    # category's disk flush overlaps the next category's conversion
+    # instead of stalling it.
+    write_futures = []
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        # Queue every category's conversions up front; the tail of one
+        # category no longer idles pool workers while its results are
+        # collected and written
+        pending = [
+            (category, submit_svg_files(
+                category.svg_files, executor, cache_dir=entry_cache
+            ))
+            for category in fetcher.get_categories()
+        ]
+
+        for category, futures in pending:
+            safe_name = _safe_filename(category.name)
+            output_path = provider_output / f"{safe_name}.xml"
 
-    for category in fetcher.get_categories():
-        safe_name = _safe_filename(category.name)
-        output_path = provider_output / f"{safe_name}.xml"
+            entries = []
+            for name, result in (future.result() for future in futures):
+                if isinstance(result, Exception):
+                    logger.info("    ✗ %s: %s", name, result)
+                else:
+                    entries.append(result)
 
-        entries = []
-        for svg_file in category.svg_files:
-            try:
-                entry = create_library_entry_from_file(svg_file)
-                entries.append(entry)
-            except Exception as e:
-                print(f"    ✗ {svg_file.name}: {e}")
+            if entries:
+                write_futures.append(
+                    writer.submit(write_library_xml, entries, output_path)
+                )
 
-        if entries:
-            library_xml = create_library_xml(entries)
-            output_path.write_text(library_xml, encoding="utf-8")
+                stats["categories"] += 1
+                stats["icons"] += len(entries)
+                stats["files"].append(output_path.relative_to(output_parent).as_posix())
 
-            stats["categories"] += 1
-            stats["icons"] += len(entries)
-            stats["files"].append(str(output_path.relative_to(output_dir.parent)))
+                logger.info(
+                    "  ✓ %s: %d icons → %s",
+                    category.name, len(entries), output_path.name,
+                )
 
-            print(f"  ✓ {category.name}: {len(entries)} icons → {output_path.name}")
+        # Surface any write error before reporting success
+        for future in write_futures:
+            future.result()
 
     return stats
 
 
+async def generate_all_libraries(
+    fetchers: list, output_dir: Path, executor: ProcessPoolExecutor
+) -> dict:
+    """Generate libraries for every provider concurrently.
+
+    Each provider's fetch is dominated by independent network I/O, so
+    running them in worker threads via asyncio.gather collapses wall-clock
+    time to roughly the slowest provider instead of the sum of all five.
+    All providers convert on the one shared process pool.
+    """
+    tasks = [
+        asyncio.to_thread(generate_libraries, fetcher, output_dir, executor)
+        for fetcher in fetchers
+    ]
+    results = await asyncio.gather(*tasks)
+    return dict(zip((fetcher.name for fetcher in fetchers), results))
+
+
 def generate_index_json(output_dir: Path, providers: dict) -> None:
     """Generate an index.json file listing all available libraries."""
-    import json
-
     index_path = output_dir / "index.json"
-    index_path.write_text(json.dumps(providers, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"\n  Generated index: {index_path}")
+    if orjson is not None:
+        index_path.write_bytes(orjson.dumps(providers, option=orjson.OPT_INDENT_2))
+    else:
+        import json
+        index_path.write_text(
+            json.dumps(providers, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+    logger.info("\n  Generated index: %s", index_path)
 
 
 def main():
@@ -101,66 +195,47 @@ def main():
     )
     
     args = parser.parse_args()
-    
+
+    handler = _BufferedStreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
     print("=" * 60)
     print("Draw.io Icon Library Generator")
     print("=" * 60)
 
-    providers_index: dict[str, dict] = {}
-
-    # Generate Azure libraries
-    azure_stats = generate_libraries(
+    # Generate all provider libraries concurrently
+    fetchers = [
         AzureFetcher(args.cache / "azure"),
-        args.output,
-    )
-    providers_index["azure"] = {
-        "name": "Azure Architecture Icons",
-        "categories": azure_stats["files"],
-        "total_icons": azure_stats["icons"],
-    }
-
-    # Generate Microsoft 365 libraries
-    m365_stats = generate_libraries(
         Microsoft365Fetcher(args.cache / "microsoft365"),
-        args.output,
-    )
-    providers_index["microsoft365"] = {
-        "name": "Microsoft 365 Architecture Icons",
-        "categories": m365_stats["files"],
-        "total_icons": m365_stats["icons"],
-    }
-
-    # Generate Dynamics 365 libraries
-    dynamics365_stats = generate_libraries(
         Dynamics365Fetcher(args.cache / "dynamics365"),
-        args.output,
-    )
-    providers_index["dynamics365"] = {
-        "name": "Microsoft Dynamics 365 Icons",
-        "categories": dynamics365_stats["files"],
-        "total_icons": dynamics365_stats["icons"],
-    }
-
-    # Generate Fabric libraries
-    fabric_stats = generate_libraries(
         FabricFetcher(args.cache / "fabric"),
-        args.output,
-    )
-    providers_index["fabric"] = {
-        "name": "Microsoft Fabric Icons",
-        "categories": fabric_stats["files"],
-        "total_icons": fabric_stats["icons"],
-    }
-
-    # Generate Entra libraries
-    entra_stats = generate_libraries(
         EntraFetcher(args.cache / "entra"),
-        args.output,
+    ]
+    # One pool of worker processes for the whole run; providers queue onto
+    # it concurrently instead of each paying the spawn cost for its own.
+    # Workers are started lazily from the provider threads, so fork is not
+    # safe here (forking a multi-threaded process can deadlock a child on
+    # a lock some other thread holds); forkserver starts workers from a
+    # clean single-threaded helper instead.
+    start_method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
     )
-    providers_index["entra"] = {
-        "name": "Microsoft Entra Architecture Icons",
-        "categories": entra_stats["files"],
-        "total_icons": entra_stats["icons"],
+    mp_context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(mp_context=mp_context) as executor:
+        all_stats = asyncio.run(
+            generate_all_libraries(fetchers, args.output, executor)
+        )
+
+    providers_index: dict[str, dict] = {
+        fetcher.name: {
+            "name": fetcher.display_name,
+            "categories": all_stats[fetcher.name]["files"],
+            "total_icons": all_stats[fetcher.name]["icons"],
+        }
+        for fetcher in fetchers
     }
 
     # Generate index